@@ -0,0 +1,7 @@
+"""ASGI entry point for production servers.
+
+Run with: hypercorn --config python:hypercorn_conf asgi:app
+"""
+from main import create_app
+
+app = create_app()
@@ -0,0 +1,12 @@
+"""Hypercorn configuration for the MCP API server."""
+import os
+
+from src.config.settings import get_settings
+
+bind = [f"{get_settings().api_host}:{get_settings().api_port}"]
+
+# Each worker runs its own asyncio loop, which owns that worker's MCP sessions
+worker_class = "asyncio"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+keep_alive_timeout = 5
+graceful_timeout = 30
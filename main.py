@@ -2,55 +2,87 @@
 """
 MCP API Server - A REST API for interacting with ModelContextProtocol servers.
 
-This script starts a Flask server that exposes endpoints for chat and tool calling.
+This script starts a Quart server that exposes endpoints for chat and tool calling.
 """
 import os
 import sys
-from flask import Flask, jsonify
-from flask_cors import CORS
+from quart import Quart, Response
+from quart_cors import cors
 
 from src.api.routes import api
-from src.api.middleware import log_request
-from src.config.settings import API_HOST, API_PORT, ENV, validate_config, SSE_ENDPOINT
-from src.utils.helpers import setup_logger
+from src.api.middleware import log_request, log_response
+from src.api.profiling import ProfilingMiddleware
+from src.client.mcp_client import close_anthropic_client, peek_client_instance, warm_client_instance
+from src.config.settings import get_settings
+from src.utils.helpers import setup_logger, dumps_json
 
 logger = setup_logger()
 
+# Constant response bodies encoded once at import
+_ROOT_BODY = dumps_json({
+    "service": "MCP Client API",
+    "version": "1.0.0",
+    "status": "running"
+})
+
 def create_app():
-    """Create and configure the Flask application.
+    """Create and configure the Quart application.
     
     Returns:
-        Flask: Configured Flask application
+        Quart: Configured Quart application
     """
-    config_issues = validate_config()
+    settings = get_settings()
+    config_issues = settings.validate()
     if config_issues:
         issues_str = ", ".join(f"{k}: {v}" for k, v in config_issues.items())
-        logger.error(f"Configuration issues: {issues_str}")
+        logger.error("Configuration issues: %s", issues_str)
         sys.exit(1)
     
-    app = Flask(__name__)
+    app = Quart(__name__)
+    # Reject oversized bodies in the framework before any route code runs
+    app.config['MAX_CONTENT_LENGTH'] = settings.max_request_bytes
+
+    if settings.profiling:
+        logger.warning("Request profiling enabled, writing profiles to %s", settings.profile_dir)
+        app.asgi_app = ProfilingMiddleware(app.asgi_app, settings.profile_dir)
     
-    CORS(app)
+    app = cors(app)
     
     app.before_request(log_request)
+    app.after_request(log_response)
+
+    # Connect to the MCP servers at boot so the first request skips the handshake;
+    # this runs once per server worker
+    @app.before_serving
+    async def warm_up():
+        await warm_client_instance(settings.sse_endpoints, settings.mcp_connect_timeout)
+
+    # Close the pooled MCP sessions before shutting down
+    @app.after_serving
+    async def close_client():
+        client = peek_client_instance()
+        if client is not None:
+            await client.cleanup()
+
+    app.after_serving(close_anthropic_client)
 
     app.register_blueprint(api, url_prefix='/api')
 
     @app.route('/', methods=['GET'])
-    def root():
-        return jsonify({
-            "service": "MCP Client API",
-            "version": "1.0.0",
-            "status": "running"
-        })
+    async def root():
+        response = Response(_ROOT_BODY, mimetype='application/json')
+        response.headers['Cache-Control'] = 'no-store'
+        return response
     
     return app
 
 if __name__ == "__main__":
+    # Development server only; production runs hypercorn --config python:hypercorn_conf asgi:app
     app = create_app()
-    debug = ENV == "development"
+    settings = get_settings()
+    debug = settings.env == "development"
     
-    logger.info(f"Starting MCP API server on {API_HOST}:{API_PORT}")
-    logger.info(f"Connecting to MCP server at {SSE_ENDPOINT}")
+    logger.info("Starting MCP API server on %s:%s", settings.api_host, settings.api_port)
+    logger.info("Connecting to MCP servers: %s", ", ".join(f"{name} at {url}" for name, url in settings.sse_endpoints.items()))
     
-    app.run(host=API_HOST, port=API_PORT, debug=debug)
\ No newline at end of file
+    app.run(host=settings.api_host, port=settings.api_port, debug=debug)
\ No newline at end of file
@@ -1,43 +1,48 @@
 """API middleware functions for the MCP client."""
-from flask import request
+from quart import request
 import time
 from src.utils.helpers import setup_logger
 
 logger = setup_logger()
 
-def log_request():
+async def log_request():
     """Log incoming API requests.
     
-    This function is designed to be used with Flask's before_request handler
+    This function is designed to be used with Quart's before_request handler
     and logs details about each incoming request.
     """
-    # Get current timestamp for request duration calculation
-    request.start_time = time.time()
+    # Get monotonic timestamp for request duration calculation
+    request.start_ns = time.perf_counter_ns()
     
     # Log the request details
-    logger.info(f"Request: {request.method} {request.path} | IP: {request.remote_addr}")
+    logger.info("Request: %s %s | IP: %s", request.method, request.path, request.remote_addr)
     
     # No need to return anything for before_request handlers
 
 
-def log_response(response):
+async def log_response(response):
     """Log outgoing API responses.
     
-    This function is designed to be used with Flask's after_request handler
+    This function is designed to be used with Quart's after_request handler
     and logs details about each outgoing response, including request duration.
+    The duration is also exposed in the X-API-Time header.
     
     Args:
-        response: The Flask response object
+        response: The Quart response object
         
     Returns:
-        response: The unmodified Flask response object
+        response: The Quart response object with the X-API-Time header set
     """
-    # Calculate request duration if start_time was set
+    # Calculate request duration if start_ns was set
     duration = 0
-    if hasattr(request, 'start_time'):
-        duration = time.time() - request.start_time
+    if hasattr(request, 'start_ns'):
+        duration = (time.perf_counter_ns() - request.start_ns) / 1e9
+        response.headers['X-API-Time'] = f"{duration:.6f}"
         
     # Log the response details
-    logger.info(f"Response: {request.method} {request.path} | Status: {response.status_code} | Duration: {duration:.4f}s")
+    logger.info(
+        "Response: %s %s | Status: %s | Duration: %.4fs",
+        request.method, request.path, response.status_code, duration
+    )
     
     return response
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""Optional per-request cProfile middleware for the MCP client API."""
+import asyncio
+import cProfile
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from src.utils.helpers import setup_logger
+
+logger = setup_logger()
+
+PROFILE_FILE_HEADER = b"x-api-cprofile-file"
+
+# cProfile hooks the whole thread, so only one request can be profiled at once
+_profile_lock = asyncio.Lock()
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles every HTTP request with cProfile.
+
+    Each request is written to its own ``.prof`` file in ``profile_dir`` and
+    the file name is returned in the X-API-CProfile-File response header. The
+    response is buffered so the header can be added after profiling, and the
+    profiler sees every coroutine running on the loop meanwhile, so this is
+    meant for diagnostics rather than regular serving. Requests arriving while
+    another request is being profiled are served without a profile.
+    """
+
+    def __init__(self, app: Callable, profile_dir: str):
+        """Wrap an ASGI application.
+
+        Args:
+            app: The ASGI application to profile
+            profile_dir: Directory the profile files are written to
+        """
+        self.app = app
+        self.profile_dir = profile_dir
+        os.makedirs(profile_dir, exist_ok=True)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable[[Dict[str, Any]], Awaitable[None]]):
+        if scope["type"] != "http" or _profile_lock.locked():
+            await self.app(scope, receive, send)
+            return
+
+        async with _profile_lock:
+            await self._profile_request(scope, receive, send)
+
+    async def _profile_request(self, scope: Dict[str, Any], receive: Callable, send: Callable[[Dict[str, Any]], Awaitable[None]]):
+        """Run one request under cProfile and add the profile file header."""
+        messages: List[Dict[str, Any]] = []
+
+        async def buffering_send(message: Dict[str, Any]):
+            messages.append(message)
+
+        profile = cProfile.Profile()
+        start_ns = time.perf_counter_ns()
+        profile.enable()
+        try:
+            await self.app(scope, receive, buffering_send)
+        finally:
+            profile.disable()
+
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        path = scope["path"].strip("/").replace("/", ".") or "root"
+        filename = f"{scope['method']}.{path}.{elapsed_ms:.0f}ms.{time.time_ns()}.prof"
+        profile.dump_stats(os.path.join(self.profile_dir, filename))
+        logger.debug("Wrote request profile %s", filename)
+
+        for message in messages:
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (PROFILE_FILE_HEADER, filename.encode("latin-1"))]
+                }
+            await send(message)
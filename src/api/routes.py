@@ -1,114 +1,176 @@
 """Modular API routes for the MCP client."""
-import asyncio
-from flask import Blueprint, request, jsonify
-from functools import wraps
+from quart import Blueprint, Response, request
+from werkzeug.exceptions import RequestEntityTooLarge
 
-from src.client.mcp_client import get_client_instance
-from src.config.settings import SSE_ENDPOINT
-from src.utils.helpers import setup_logger
+from src.client.mcp_client import get_client_instance, peek_client_instance
+from src.config.settings import get_settings
+from src.utils.helpers import setup_logger, dumps_json, loads_json
 
 # Constants for HTTP status codes
 HTTP_OK = 200
+HTTP_NOT_MODIFIED = 304
 HTTP_BAD_REQUEST = 400
 HTTP_NOT_FOUND = 404
 HTTP_METHOD_NOT_ALLOWED = 405
+HTTP_PAYLOAD_TOO_LARGE = 413
 HTTP_UNSUPPORTED_MEDIA_TYPE = 415
 HTTP_INTERNAL_SERVER_ERROR = 500
+HTTP_SERVICE_UNAVAILABLE = 503
 
 logger = setup_logger()
 api = Blueprint('api', __name__)
 
-# Utility decorator to handle async route functions
-def async_route(route_function):
-    @wraps(route_function)
-    def wrapper(*args, **kwargs):
-        return asyncio.run(route_function(*args, **kwargs))
-    return wrapper
+# Constant response bodies encoded once at import
+_HEALTH_BODY = dumps_json({
+    "status": "ok",
+    "service": "mcp-client-api"
+})
+
+class PayloadTooLargeError(ValueError):
+    """Raised when a request body exceeds MAX_REQUEST_BYTES."""
 
 # Validation helper function
-def validate_json(required_fields):
+async def validate_json(required_fields):
     if not request.is_json:
         raise ValueError("Content-Type must be application/json")
 
-    data = request.json
+    # Reject oversized bodies from the declared length before reading them
+    max_request_bytes = get_settings().max_request_bytes
+    if request.content_length is not None and request.content_length > max_request_bytes:
+        raise PayloadTooLargeError(f"Request body exceeds {max_request_bytes} bytes")
+
+    try:
+        data = loads_json(await request.get_data(cache=False))
+    except RequestEntityTooLarge:
+        raise PayloadTooLargeError(f"Request body exceeds {max_request_bytes} bytes")
+    except ValueError:
+        raise ValueError("Request body must be valid JSON")
+
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+
     missing_fields = [field for field in required_fields if field not in data]
     if missing_fields:
         raise ValueError(f"Missing fields in request body: {', '.join(missing_fields)}")
 
     return data
 
+# JSON response helper function
+def json_response(payload, status_code=HTTP_OK):
+    return Response(dumps_json(payload), status=status_code, mimetype='application/json')
+
 # Error response helper function
 def error_response(message, status_code):
-    return jsonify({
+    return json_response({
         "status": "error",
         "error": message
-    }), status_code
+    }, status_code)
 
 # Routes
 @api.route('/health', methods=['GET'])
-def health_check():
+async def health_check():
     """Health check endpoint."""
-    return jsonify({
-        "status": "ok",
-        "service": "mcp-client-api"
-    }), HTTP_OK
+    response = Response(_HEALTH_BODY, status=HTTP_OK, mimetype='application/json')
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@api.route('/ready', methods=['GET'])
+async def readiness_check():
+    """Readiness endpoint, healthy only once the MCP client is connected."""
+    client = peek_client_instance()
+    if client is None or not client.connected:
+        response = error_response("MCP client not connected", HTTP_SERVICE_UNAVAILABLE)
+    else:
+        response = json_response({
+            "status": "ready",
+            "service": "mcp-client-api"
+        })
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 @api.route('/chat', methods=['POST'])
-@async_route
 async def process_chat():
     """Process a chat message."""
     try:
-        data = validate_json(required_fields=['prompt'])
+        data = await validate_json(required_fields=['prompt'])
         message = data['prompt']
 
-        logger.info(f"Processing chat request: {message}")
-        client = await get_client_instance(SSE_ENDPOINT)
+        logger.info("Processing chat request: %s", message)
+        client = await get_client_instance(get_settings().sse_endpoints)
         result = await client.process_query(message)
 
-        return jsonify({
+        return json_response({
             "status": "success",
             "data": result
-        }), HTTP_OK
+        })
+
+    except PayloadTooLargeError as pe:
+        logger.warning("Rejected request: %s", pe)
+        return error_response(str(pe), HTTP_PAYLOAD_TOO_LARGE)
 
     except ValueError as ve:
-        logger.warning(f"Validation error: {ve}")
+        logger.warning("Validation error: %s", ve)
         return error_response(str(ve), HTTP_BAD_REQUEST)
 
     except Exception as e:
-        logger.error(f"Unhandled error during chat processing: {e}")
+        logger.error("Unhandled error during chat processing: %s", e)
         return error_response("Internal server error", HTTP_INTERNAL_SERVER_ERROR)
 
 @api.route('/tools', methods=['GET'])
-@async_route
 async def get_tools():
     """Get available tools from the MCP server."""
     try:
         logger.info("Fetching available tools")
-        client = await get_client_instance(SSE_ENDPOINT)
-        tools = await client.get_available_tools()
-
+        client = await get_client_instance(get_settings().sse_endpoints)
+        body, etag = await client.get_available_tools_body()
 
-        return jsonify({
-            "status": "success",
-            "tools": tools
-        }), HTTP_OK
+        if request.if_none_match.contains_weak(etag):
+            response = Response(b"", status=HTTP_NOT_MODIFIED)
+        else:
+            response = Response(body, status=HTTP_OK, mimetype='application/json')
+        response.set_etag(etag)
+        return response
 
     except Exception as e:
-        logger.error(f"Error fetching tools: {e}")
+        logger.error("Error fetching tools: %s", e)
         return error_response("Could not retrieve tools", HTTP_INTERNAL_SERVER_ERROR)
 
+@api.route('/metrics', methods=['GET'])
+async def get_metrics():
+    """Get client capacity metrics."""
+    client = peek_client_instance()
+    if client is None:
+        max_inflight = get_settings().anthropic_max_inflight
+        metrics = {
+            "anthropic_inflight": 0,
+            "anthropic_max_inflight": max_inflight,
+            "anthropic_available_slots": max_inflight
+        }
+    else:
+        metrics = client.processor.get_metrics()
+
+    return json_response({
+        "status": "success",
+        "metrics": metrics
+    })
+
 # Error handlers
 @api.errorhandler(HTTP_NOT_FOUND)
-def not_found(e):
-    logger.warning(f"404 error: {request.path} not found")
+async def not_found(e):
+    logger.warning("404 error: %s not found", request.path)
     return error_response("Resource not found", HTTP_NOT_FOUND)
 
 @api.errorhandler(HTTP_METHOD_NOT_ALLOWED)
-def method_not_allowed(e):
-    logger.warning(f"405 error: Method {request.method} not allowed on {request.path}")
+async def method_not_allowed(e):
+    logger.warning("405 error: Method %s not allowed on %s", request.method, request.path)
     return error_response("Method not allowed", HTTP_METHOD_NOT_ALLOWED)
 
+@api.errorhandler(HTTP_PAYLOAD_TOO_LARGE)
+async def payload_too_large(e):
+    logger.warning("413 error: Request body too large on %s", request.path)
+    return error_response("Request body too large", HTTP_PAYLOAD_TOO_LARGE)
+
 @api.errorhandler(HTTP_UNSUPPORTED_MEDIA_TYPE)
-def unsupported_media_type(e):
+async def unsupported_media_type(e):
     logger.warning("415 error: Unsupported Media Type")
     return error_response("Unsupported Media Type, must be application/json", HTTP_UNSUPPORTED_MEDIA_TYPE)
\ No newline at end of file
@@ -1,72 +1,186 @@
 """MCP Server connection management."""
-import os
-from typing import Optional, Dict, Any
-from contextlib import AsyncExitStack
+import asyncio
+from typing import Dict, Any, List, Set, Tuple
 
+import anyio
 from mcp import ClientSession
-from mcp.server.sse import SseServerTransport
+from mcp.client.sse import sse_client
 
 from src.utils.helpers import setup_logger
 
 logger = setup_logger()
 
+# Errors raised by a session whose transport has gone away
+TRANSPORT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, ConnectionError)
+
+def _unwrap_exception_group(error: BaseException) -> BaseException:
+    """Return the underlying error of exception groups with a single member.
+    
+    The anyio task groups used by the SSE transport wrap errors in exception
+    groups whose message hides the actual cause.
+    """
+    while isinstance(getattr(error, "exceptions", None), tuple) and len(error.exceptions) == 1:
+        error = error.exceptions[0]
+    return error
+
 class ServerConnection:
-    """Manages connections to ModelContextProtocol servers via SSE."""
+    """Manages connections to one or more ModelContextProtocol servers via SSE.
+    
+    Tools from every connected server are collected into a registry so that
+    tool calls are routed to the server that provides them. Each server's
+    transport and session are owned by a dedicated task, because the anyio
+    cancel scopes they open can only be exited by the task that entered them.
+    """
+    
+    __slots__ = ("sessions", "tool_registry", "_tasks", "_closing", "_broken")
     
     def __init__(self):
         """Initialize the server connection manager."""
-        self.session: Optional[ClientSession] = None
-        self.exit_stack = AsyncExitStack()
+        self.sessions: Dict[str, ClientSession] = {}
+        self.tool_registry: Dict[str, Tuple[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._closing = asyncio.Event()
+        self._broken: Set[str] = set()
+    
+    @property
+    def healthy(self) -> bool:
+        """Whether every server session is connected, its owner task is running
+        and no tool call has hit a closed transport."""
+        return bool(self._tasks) and not self._broken and all(
+            name in self.sessions and not task.done() for name, task in self._tasks.items()
+        )
     
-    async def connect_sse(self, endpoint: str) -> bool:
-        """Connect to an MCP server via SSE.
+    async def connect(self, endpoints: Dict[str, str]) -> bool:
+        """Connect to several MCP servers concurrently.
+        
+        Servers that fail to connect are logged and left out, so the
+        connection keeps working with the tools of the servers that did.
         
         Args:
-            endpoint: The SSE endpoint URL
+            endpoints: Mapping of server name to SSE endpoint URL
             
         Returns:
-            bool: True if connection successful, False otherwise
+            bool: True if every connection was successful
             
         Raises:
-            ConnectionError: If connection to server fails
+            ConnectionError: If no server could be connected
         """
         try:
-            logger.info(f"Connecting to SSE endpoint: {endpoint}")
-            streams = await self.exit_stack.enter_async_context(SseServerTransport(endpoint))
-            self.session = await self.exit_stack.enter_async_context(ClientSession(streams[0], streams[1]))
-            
-            # Initialize session
-            await self.session.initialize()
-            logger.info("SSE server connection established successfully")
+            results = await asyncio.gather(
+                *(self.connect_sse(name, endpoint) for name, endpoint in endpoints.items()),
+                return_exceptions=True
+            )
+        except BaseException:
+            await self.cleanup()
+            raise
+        
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == len(results):
+            await self.cleanup()
+            raise ConnectionError(f"Failed to connect to all {len(endpoints)} SSE servers: {errors[0]}")
+        
+        if errors:
+            logger.warning("Connected to %d of %d SSE servers", len(results) - len(errors), len(endpoints))
+        
+        return not errors
+    
+    async def connect_sse(self, name: str, endpoint: str) -> bool:
+        """Connect to an MCP server via SSE and register its tools.
+        
+        Starts the task that owns the server's session and waits until it
+        reports the session as ready.
+        
+        Args:
+            name: Name identifying the server
+            endpoint: The SSE endpoint URL
             
-            return True
+        Returns:
+            bool: True if connection successful
             
+        Raises:
+            ConnectionError: If connection to server fails
+        """
+        logger.info("Connecting to SSE endpoint %s: %s", name, endpoint)
+        ready = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(self._run_session(name, endpoint, ready), name=f"mcp-session-{name}")
+        self._tasks[name] = task
+        
+        try:
+            await ready
+        except asyncio.CancelledError:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise
         except Exception as e:
-            logger.error(f"Failed to connect to SSE server: {e}")
-            await self.cleanup()
-            raise ConnectionError(f"Failed to connect to SSE server: {e}")
+            # The owner task has already left its contexts, so forget the server
+            await asyncio.gather(task, return_exceptions=True)
+            self._tasks.pop(name, None)
+            
+            cause = _unwrap_exception_group(e)
+            logger.error("Failed to connect to SSE server %s: %r", name, cause)
+            raise ConnectionError(f"Failed to connect to SSE server {name}: {cause!r}") from e
+        
+        return True
     
-    async def list_tools(self) -> Dict[str, Any]:
-        """List available tools from the connected MCP server.
+    async def _run_session(self, name: str, endpoint: str, ready: asyncio.Future):
+        """Own one server's transport and session until the connection closes.
+        
+        Args:
+            name: Name identifying the server
+            endpoint: The SSE endpoint URL
+            ready: Future resolved once the session is initialized
+        """
+        try:
+            async with sse_client(endpoint) as streams:
+                async with ClientSession(streams[0], streams[1]) as session:
+                    # Initialize session
+                    await session.initialize()
+                    response = await session.list_tools()
+                    
+                    # Register the server's tools for routing
+                    self.sessions[name] = session
+                    for tool in response.tools:
+                        if tool.name in self.tool_registry:
+                            logger.warning("Tool %s from %s shadows tool from %s", tool.name, name, self.tool_registry[tool.name][0])
+                        self.tool_registry[tool.name] = (name, tool)
+                    
+                    logger.info("SSE server connection to %s established with %d tools", name, len(response.tools))
+                    ready.set_result(True)
+                    
+                    await self._closing.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.error("SSE server connection to %s lost: %r", name, _unwrap_exception_group(e))
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self.sessions.pop(name, None)
+            self.tool_registry = {
+                tool_name: entry for tool_name, entry in self.tool_registry.items() if entry[0] != name
+            }
+    
+    async def list_tools(self) -> List[Any]:
+        """List available tools from all connected MCP servers.
         
         Returns:
-            Dict[str, Any]: Server response containing available tools
+            List[Any]: Tools registered across all servers
             
         Raises:
-            ConnectionError: If the server is not connected
+            ConnectionError: If no server is connected
         """
-        if not self.session:
+        if not self.sessions:
             raise ConnectionError("Not connected to an MCP server")
             
-        try:
-            response = await self.session.list_tools()
-            return response
-        except Exception as e:
-            logger.error(f"Error listing tools: {e}")
-            raise
+        return [tool for _, tool in self.tool_registry.values()]
     
     async def call_tool(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
-        """Call a tool on the connected MCP server.
+        """Call a tool on the MCP server that provides it.
         
         Args:
             tool_name: Name of the tool to call
@@ -77,24 +191,43 @@ class ServerConnection:
             
         Raises:
             ConnectionError: If the server is not connected
+            ValueError: If no connected server provides the tool
             Exception: If tool execution fails
         """
-        if not self.session:
+        if not self.sessions:
             raise ConnectionError("Not connected to an MCP server")
+        
+        if tool_name not in self.tool_registry:
+            raise ValueError(f"Unknown tool: {tool_name}")
             
+        server_name, _ = self.tool_registry[tool_name]
         try:
-            logger.debug(f"Calling tool {tool_name} with args: {args}")
-            result = await self.session.call_tool(tool_name, args)
+            logger.debug("Calling tool %s on %s with args: %s", tool_name, server_name, args)
+            result = await self.sessions[server_name].call_tool(tool_name, args)
             return result
+        except TRANSPORT_ERRORS as e:
+            logger.error("Transport to %s closed while calling tool %s: %r", server_name, tool_name, e)
+            self._broken.add(server_name)
+            raise
         except Exception as e:
-            logger.error(f"Error calling tool {tool_name}: {e}")
+            logger.error("Error calling tool %s: %s", tool_name, e)
             raise
     
     async def cleanup(self):
-        """Clean up resources."""
+        """Clean up resources.
+        
+        Signals every session owner task to exit its contexts and waits for them.
+        """
         try:
             logger.info("Cleaning up server connection resources")
-            await self.exit_stack.aclose()
-            self.session = None
-        except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
\ No newline at end of file
+            self._closing.set()
+            results = await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Error closing server session: %s", result)
+        finally:
+            self._tasks = {}
+            self.sessions = {}
+            self.tool_registry = {}
+            self._closing = asyncio.Event()
+            self._broken = set()
@@ -1,63 +1,188 @@
 """Client for interacting with ModelContextProtocol servers."""
 import sys
-from typing import List, Dict, Any, Optional
+import hashlib
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
 
-from anthropic import Anthropic
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
 
 from src.client.connection import ServerConnection
-from src.config.settings import ANTHROPIC_API_KEY, MODEL_NAME, MAX_TOKENS, validate_config
+from src.client.pool import ConnectionPool
+from src.config.settings import get_settings
 from src.client.processor import MessageProcessor
-from src.utils.helpers import setup_logger
+from src.utils.helpers import setup_logger, dumps_json
 
 logger = setup_logger()
 
+# Shared client so every model call reuses pooled HTTP/2 connections
+_anthropic_client: Optional[AsyncAnthropic] = None
+
+def get_anthropic_client() -> AsyncAnthropic:
+    """Get or create the process-wide Anthropic client.
+    
+    Returns:
+        AsyncAnthropic: Shared client backed by a keepalive HTTP/2 connection pool
+    """
+    global _anthropic_client
+    
+    if _anthropic_client is None:
+        settings = get_settings()
+        # The SDK's own client class keeps its default timeout and works with
+        # whichever httpx package the installed SDK version is built on
+        http_client = DefaultAsyncHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=60)
+        )
+        _anthropic_client = AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            max_retries=settings.anthropic_max_retries,
+            http_client=http_client
+        )
+        
+    return _anthropic_client
+
+async def close_anthropic_client():
+    """Close the shared Anthropic client and its HTTP connections."""
+    global _anthropic_client
+    
+    if _anthropic_client is not None:
+        await _anthropic_client.close()
+    _anthropic_client = None
+
 class MCPClient:
     """Client for interacting with ModelContextProtocol servers."""
     
+    __slots__ = (
+        "anthropic",
+        "pool",
+        "processor",
+        "available_tools",
+        "available_tools_body",
+        "available_tools_etag",
+        "endpoints",
+        "_connect_lock",
+    )
+    
     def __init__(self):
         """Initialize the MCP client."""
         # Validate configuration
-        config_issues = validate_config()
+        settings = get_settings()
+        config_issues = settings.validate()
         if config_issues:
             issues_str = ", ".join(f"{k}: {v}" for k, v in config_issues.items())
             raise ValueError(f"Configuration issues: {issues_str}")
         
         # Initialize components
-        self.anthropic = Anthropic(api_key=ANTHROPIC_API_KEY)
-        self.connection = ServerConnection()
-        self.processor = MessageProcessor(self.anthropic, self.connection)
-        self.available_tools = []
-        self.connection_url = None
+        self.anthropic = get_anthropic_client()
+        self.pool: Optional[ConnectionPool] = None
+        self.processor = MessageProcessor(self.anthropic, settings.anthropic_max_inflight)
+        self.available_tools: Tuple[Dict[str, Any], ...] = ()
+        self.available_tools_body: Optional[bytes] = None
+        self.available_tools_etag: Optional[str] = None
+        self.endpoints: Dict[str, str] = {}
+        self._connect_lock = asyncio.Lock()
         
-    async def connect(self, connection_url: str) -> bool:
-        """Connect to an MCP server via SSE.
+    @property
+    def connected(self) -> bool:
+        """Whether the client has a pool with at least one healthy connection."""
+        return self.pool is not None and self.pool.healthy
+    
+    async def connect(self, endpoints: Dict[str, str]) -> bool:
+        """Connect to MCP servers via SSE.
         
         Args:
-            connection_url: Server SSE endpoint URL
+            endpoints: Mapping of server name to SSE endpoint URL
             
         Returns:
             bool: True if connection successful
         """
+        self.endpoints = endpoints
+        settings = get_settings()
+        pool = ConnectionPool(
+            endpoints,
+            settings.mcp_pool_size,
+            settings.mcp_connect_timeout,
+            on_connect=self._update_tools
+        )
+
         try:
-            self.connection_url = connection_url
-            connected = await self.connection.connect_sse(connection_url)
-            
-            if connected:
-                # Fetch and store available tools
-                response = await self.connection.list_tools()
-                self.available_tools = [{
-                    "name": tool.name,
-                    "description": tool.description,
-                    "input_schema": tool.inputSchema
-                } for tool in response.tools]
-                
-                logger.info(f"Connected to server with {len(self.available_tools)} tools")
-                return True
-                
+            # Open the first pooled connection, which fetches the available tools
+            async with pool.acquire() as connection:
+                connected_servers = len(connection.sessions)
+            self.pool = pool
+
+            logger.info("Connected to %d of %d servers with %d tools", connected_servers, len(endpoints), len(self.available_tools))
+            return True
+
         except Exception as e:
-            logger.error(f"Connection failed: {e}")
+            logger.error("Connection failed: %s", e)
+            await pool.close()
             return False
+
+        except BaseException:
+            # Cancelled mid-handshake, e.g. by the warm-up timeout
+            await pool.close()
+            raise
+    
+    async def _update_tools(self, connection: ServerConnection):
+        """Rebuild the cached tools from a newly opened pooled connection.
+        
+        Pooled connections can come up with a different set of servers, so
+        the cache is rebuilt whenever the tool set changes.
+        
+        Args:
+            connection: Newly opened connection
+        """
+        # Sorted because registry order depends on which server connected first
+        tools = sorted(await connection.list_tools(), key=lambda tool: tool.name)
+        
+        # Built once per tool set and handed to every model call as-is
+        available_tools = tuple({
+            "name": tool.name,
+            "description": tool.description,
+            "input_schema": tool.inputSchema
+        } for tool in tools)
+        if available_tools == self.available_tools and self.available_tools_body is not None:
+            return
+        
+        if self.available_tools_body is not None:
+            logger.info("MCP tool set changed to %d tools", len(available_tools))
+        
+        # Pre-encode the /tools response; the tool set only changes with new connections
+        self.available_tools = available_tools
+        self.available_tools_body = dumps_json({
+            "status": "success",
+            "tools": self.available_tools
+        })
+        self.available_tools_etag = hashlib.blake2b(self.available_tools_body, digest_size=8).hexdigest()
+    
+    async def _ensure_connected(self):
+        """Reconnect if there is no open connection pool.
+        
+        Concurrent callers share one reconnect attempt instead of each
+        building, and leaking, a separate pool. The attempt is bounded by the
+        connect timeout so a server that never answers cannot hold every
+        request queued behind the lock.
+        
+        Raises:
+            ConnectionError: If the client cannot connect to the servers
+        """
+        if self.pool:
+            return
+        
+        async with self._connect_lock:
+            if self.pool:
+                return
+            
+            timeout = get_settings().mcp_connect_timeout
+            try:
+                connected = await asyncio.wait_for(self.connect(self.endpoints), timeout=timeout)
+            except asyncio.TimeoutError:
+                raise ConnectionError(f"Timed out connecting to MCP servers after {timeout:.1f}s")
+            
+            if not connected:
+                raise ConnectionError("Not connected to an MCP server")
     
     async def process_query(self, query: str) -> Dict[str, Any]:
         """Process a user query.
@@ -69,55 +194,59 @@ class MCPClient:
             Dict[str, Any]: Response with text and metadata
         """
         try:
-            if not self.connection.session:
-                await self.connect(self.connection_url)
-                
-            response = await self.processor.process_query(query, self.available_tools)
+            await self._ensure_connected()
+
+            response = await self.processor.process_query(query, self.available_tools, self.pool)
             return {
                 "status": "success",
                 "response": response
             }
         except Exception as e:
-            logger.error(f"Error processing query: {e}")
+            logger.error("Error processing query: %s", e)
             return {
                 "status": "error",
                 "error": str(e)
             }
     
-    async def get_available_tools(self) -> Dict[str, Any]:
-        """Get available tools from the connected server.
+    async def get_available_tools_body(self) -> Tuple[bytes, str]:
+        """Get the pre-encoded available tools response.
         
         Returns:
-            Dict[str, Any]: Available tools information
+            Tuple[bytes, str]: JSON response body and its ETag
+            
+        Raises:
+            ConnectionError: If the client cannot connect to the servers
         """
-        try:
-            if not self.connection.session:
-                await self.connect(self.connection_url)
-                
-            return {
-                "status": "success",
-                "tools": self.available_tools
-            }
-        except Exception as e:
-            logger.error(f"Error getting available tools: {e}")
-            return {
-                "status": "error",
-                "error": str(e)
-            }
+        await self._ensure_connected()
+            
+        return self.available_tools_body, self.available_tools_etag
     
     async def cleanup(self):
         """Clean up resources."""
-        await self.connection.cleanup()
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+        self.available_tools = ()
+        self.available_tools_body = None
+        self.available_tools_etag = None
 
 # Singleton instance
 _client_instance = None
 _client_lock = asyncio.Lock()
 
-async def get_client_instance(connection_url: str = None) -> MCPClient:
+def peek_client_instance() -> Optional[MCPClient]:
+    """Get the MCP client singleton instance without creating it.
+    
+    Returns:
+        Optional[MCPClient]: Singleton client instance, or None if not created yet
+    """
+    return _client_instance
+
+async def get_client_instance(endpoints: Optional[Dict[str, str]] = None) -> MCPClient:
     """Get or create the MCP client singleton instance.
     
     Args:
-        connection_url: Optional connection URL to use if client needs to be created
+        endpoints: Optional server name to SSE endpoint mapping used if client needs to be created
         
     Returns:
         MCPClient: Singleton client instance
@@ -126,10 +255,29 @@ async def get_client_instance(connection_url: str = None) -> MCPClient:
     
     async with _client_lock:
         if _client_instance is None:
-            if not connection_url:
-                raise ValueError("Connection URL is required for initial client creation")
+            if not endpoints:
+                raise ValueError("SSE endpoints are required for initial client creation")
                 
             _client_instance = MCPClient()
-            await _client_instance.connect(connection_url)
+            await _client_instance.connect(endpoints)
             
-    return _client_instance
\ No newline at end of file
+    return _client_instance
+
+async def warm_client_instance(endpoints: Dict[str, str], timeout: float = 10.0):
+    """Create and connect the MCP client singleton ahead of the first request.
+    
+    Failures are logged rather than raised so the server still starts; the
+    client reconnects lazily on the next request.
+    
+    Args:
+        endpoints: Server name to SSE endpoint mapping
+        timeout: Seconds to wait for the connection
+    """
+    try:
+        client = await asyncio.wait_for(get_client_instance(endpoints), timeout=timeout)
+        if not client.connected:
+            logger.warning("MCP client warm-up could not connect; will retry on first request")
+    except asyncio.TimeoutError:
+        logger.warning("MCP client warm-up timed out after %.1fs; will retry on first request", timeout)
+    except Exception as e:
+        logger.warning("MCP client warm-up failed: %s", e)
\ No newline at end of file
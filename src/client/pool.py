@@ -0,0 +1,120 @@
+"""Pool of MCP server connections."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from src.client.connection import ServerConnection
+from src.utils.helpers import setup_logger
+
+logger = setup_logger()
+
+class ConnectionPool:
+    """Bounded pool of connections to the same set of MCP servers.
+
+    Connections are opened lazily, up to the pool size, so concurrent queries
+    do not queue behind a single stream-ordered session.
+    """
+
+    def __init__(
+        self,
+        endpoints: Dict[str, str],
+        size: int,
+        connect_timeout: float,
+        on_connect: Optional[Callable[[ServerConnection], Awaitable[None]]] = None
+    ):
+        """Initialize the connection pool.
+
+        Args:
+            endpoints: Mapping of server name to SSE endpoint URL
+            size: Maximum number of open connections
+            connect_timeout: Seconds to wait for a new connection
+            on_connect: Optional coroutine function called with every newly
+                opened connection before it is handed out
+        """
+        if size < 1:
+            raise ValueError("Connection pool size must be at least 1")
+
+        self.endpoints = endpoints
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self.on_connect = on_connect
+        self._slots = asyncio.Semaphore(size)
+        self._idle: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self._connections: List[ServerConnection] = []
+
+    @property
+    def healthy(self) -> bool:
+        """Whether at least one open connection, idle or borrowed, is healthy."""
+        return any(connection.healthy for connection in self._connections)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ServerConnection]:
+        """Borrow a connection from the pool.
+
+        A connection is closed and dropped instead of returned to the pool if
+        the borrower raises or any of its server sessions has gone away.
+
+        Yields:
+            ServerConnection: Connected server connection
+
+        Raises:
+            ConnectionError: If a new connection cannot be established
+        """
+        async with self._slots:
+            connection = await self._get()
+            try:
+                yield connection
+            except BaseException:
+                await self._discard(connection)
+                raise
+            await self._release(connection)
+
+    async def _get(self) -> ServerConnection:
+        """Take a healthy idle connection, opening a new one if none is idle."""
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            if connection.healthy:
+                return connection
+            logger.warning("Discarding broken idle connection from pool")
+            await self._discard(connection)
+
+        connection = ServerConnection()
+        try:
+            await asyncio.wait_for(connection.connect(self.endpoints), timeout=self.connect_timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionError(f"Timed out connecting to MCP servers after {self.connect_timeout:.1f}s")
+
+        if self.on_connect is not None:
+            try:
+                await self.on_connect(connection)
+            except BaseException:
+                await connection.cleanup()
+                raise
+
+        self._connections.append(connection)
+        logger.info("Opened pooled connection %d/%d", len(self._connections), self.size)
+        return connection
+
+    async def _release(self, connection: ServerConnection):
+        """Return a connection to the pool, discarding it if it is broken."""
+        if not connection.healthy:
+            logger.warning("Discarding broken connection from pool")
+            await self._discard(connection)
+            return
+
+        self._idle.put_nowait(connection)
+
+    async def _discard(self, connection: ServerConnection):
+        """Close a connection and remove it from the pool."""
+        if connection in self._connections:
+            self._connections.remove(connection)
+        await connection.cleanup()
+
+    async def close(self):
+        """Close every connection owned by the pool."""
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            await connection.cleanup()
@@ -1,33 +1,52 @@
 """Message processing and tool calling functionality."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
+import asyncio
 import json
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 
+from src.client.pool import ConnectionPool
 from src.utils.helpers import setup_logger, format_tool_response
-from src.config.settings import MODEL_NAME, MAX_TOKENS
+from src.config.settings import get_settings
 
 logger = setup_logger()
 
 class MessageProcessor:
     """Processes messages and handles tool calling."""
     
-    def __init__(self, anthropic_client: Anthropic, connection):
+    __slots__ = ("anthropic", "max_inflight", "_inflight", "_sem")
+    
+    def __init__(self, anthropic_client: AsyncAnthropic, max_inflight: int):
         """Initialize the message processor.
         
         Args:
-            anthropic_client: Initialized Anthropic client
-            connection: Server connection manager
+            anthropic_client: Initialized async Anthropic client
+            max_inflight: Maximum number of concurrent model calls
         """
         self.anthropic = anthropic_client
-        self.connection = connection
+        self.max_inflight = max_inflight
+        self._inflight = 0
+        self._sem = asyncio.Semaphore(max_inflight)
     
-    async def process_query(self, query: str, available_tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_metrics(self) -> Dict[str, int]:
+        """Get model call concurrency metrics.
+        
+        Returns:
+            Dict[str, int]: In-flight model calls and remaining capacity
+        """
+        return {
+            "anthropic_inflight": self._inflight,
+            "anthropic_max_inflight": self.max_inflight,
+            "anthropic_available_slots": self.max_inflight - self._inflight
+        }
+    
+    async def process_query(self, query: str, available_tools: Sequence[Dict[str, Any]], pool: ConnectionPool) -> Dict[str, Any]:
         """Process a query using Claude and available tools.
         
         Args:
             query: User input query
-            available_tools: List of available tools
+            available_tools: Tool definitions passed to the model
+            pool: Connection pool a connection is borrowed from for each batch of tool calls
             
         Returns:
             Dict[str, Any]: Response with text, tool calls, and results
@@ -47,17 +66,29 @@ class MessageProcessor:
             "tool_results": []
         }
         
+        settings = get_settings()
+        
         # Process the conversation until no more tool calls
         while True:
-            # Call the model
-            logger.debug(f"Sending {len(messages)} messages to model")
-            response = self.anthropic.messages.create(
-                model=MODEL_NAME,
-                max_tokens=MAX_TOKENS,
-                messages=messages,
-                tools=available_tools,
-                stream=False,
-            )
+            # Call the model, queueing here rather than behind Anthropic rate limits
+            logger.debug("Sending %d messages to model", len(messages))
+            async with self._sem:
+                self._inflight += 1
+                try:
+                    response = await self.anthropic.messages.create(
+                        model=settings.model_name,
+                        max_tokens=settings.max_tokens,
+                        messages=messages,
+                        tools=available_tools,
+                    )
+                finally:
+                    self._inflight -= 1
+            
+            if response.usage.input_tokens > settings.input_token_warning_threshold:
+                logger.warning(
+                    "Model call used %d input tokens with %d messages; consider lowering MAX_HISTORY_MESSAGES",
+                    response.usage.input_tokens, len(messages)
+                )
             
             # Process the response content
             assistant_message_content = []
@@ -96,62 +127,85 @@ class MessageProcessor:
                 "content": assistant_message_content
             })
             
-            # Process tool calls
-            for tool_call in tool_calls:
+            # Execute all tool calls concurrently, holding a connection only for the batch
+            async with pool.acquire() as connection:
+                tool_outcomes = await asyncio.gather(
+                    *(connection.call_tool(tool_call.name, tool_call.input) for tool_call in tool_calls),
+                    return_exceptions=True
+                )
+            
+            # Collect every tool result into a single user message
+            tool_result_content = []
+            for tool_call, outcome in zip(tool_calls, tool_outcomes):
                 tool_name = tool_call.name
                 tool_args = tool_call.input
                 
-                try:
-                    # Execute the tool call
-                    result_data = await self.connection.call_tool(tool_name, tool_args)
-                    
-                    # Add tool result to results
-                    tool_result = {
-                        "tool_use_id": tool_call.id,
-                        "name": tool_name,
-                        "args": tool_args,
-                        "result": result_data.content,
-                        "status": "success"
-                    }
-                    result["tool_results"].append(tool_result)
-                    
-                    # Add tool result to conversation
-                    messages.append({
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "tool_result",
-                                "tool_use_id": tool_call.id,
-                                "content": result_data.content
-                            }
-                        ]
-                    })
-                    
-                except Exception as e:
-                    error_message = f"Error executing tool {tool_name}: {str(e)}"
-                    logger.error(error_message)
+                if isinstance(outcome, Exception):
+                    # Transport errors such as anyio.ClosedResourceError have no message
+                    error = str(outcome) or repr(outcome)
+                    logger.error("Error executing tool %s: %s", tool_name, error)
                     
                     # Add error result to results
-                    tool_result = {
+                    result["tool_results"].append({
                         "tool_use_id": tool_call.id,
                         "name": tool_name,
                         "args": tool_args,
-                        "error": str(e),
+                        "error": error,
                         "status": "error"
-                    }
-                    result["tool_results"].append(tool_result)
+                    })
                     
-                    # Add error result to conversation
-                    messages.append({
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "tool_result",
-                                "tool_use_id": tool_call.id,
-                                "content": f"Error: {str(e)}"
-                            }
-                        ]
+                    tool_result_content.append({
+                        "type": "tool_result",
+                        "tool_use_id": tool_call.id,
+                        "content": f"Error: {error}",
+                        "is_error": True
                     })
+                    continue
+                
+                # Add tool result to results
+                result["tool_results"].append({
+                    "tool_use_id": tool_call.id,
+                    "name": tool_name,
+                    "args": tool_args,
+                    "result": outcome.content,
+                    "status": "success"
+                })
+                
+                tool_result_content.append({
+                    "type": "tool_result",
+                    "tool_use_id": tool_call.id,
+                    "content": outcome.content
+                })
+            
+            # Add tool results to conversation
+            messages.append({
+                "role": "user",
+                "content": tool_result_content
+            })
+            
+            self._trim_history(messages, settings.max_history_messages)
         
         # Return the complete result
-        return result
\ No newline at end of file
+        return result
+    
+    @staticmethod
+    def _trim_history(messages: List[Dict[str, Any]], max_messages: int):
+        """Cap the conversation at max_messages, in place.
+        
+        The original user query is always kept. The remaining window starts
+        at an assistant message so every tool_use block stays paired with the
+        tool_result message that follows it.
+        
+        Args:
+            messages: Conversation messages, starting with the user query
+            max_messages: Maximum number of messages to keep
+        """
+        if len(messages) <= max_messages:
+            return
+        
+        start = len(messages) - (max_messages - 1)
+        while start < len(messages) and messages[start]["role"] != "assistant":
+            start += 1
+        
+        logger.debug("Trimming %d messages from conversation history", start - 1)
+        del messages[1:start]
\ No newline at end of file
@@ -1,34 +1,135 @@
 """Configuration settings for the MCP client application."""
 import os
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-MODEL_NAME = os.getenv("MODEL_NAME", "claude-3-5-sonnet-20241022")
-MAX_TOKENS = int(os.getenv("MAX_TOKENS", "1000"))
-
-SSE_ENDPOINT = os.getenv("SSE_ENDPOINT", "http://localhost:8000/sse")
-API_HOST = os.getenv("API_HOST", "0.0.0.0")
-API_PORT = int(os.getenv("API_PORT", "5000"))
-ENV = os.getenv("ENV", "development")
-
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-
-def validate_config() -> Dict[str, Any]:
-    """Validate essential configuration settings.
+def parse_sse_endpoints(raw: Optional[str]) -> Dict[str, str]:
+    """Parse the SSE_ENDPOINT setting into a mapping of server name to URL.
     
+    Accepts a JSON object (``{"flights": "http://..."}``), a comma-delimited
+    list of ``name=url`` pairs, or bare URLs which are named automatically.
+    
+    Args:
+        raw: Raw setting value
+        
     Returns:
-        Dict[str, Any]: Dictionary of validation issues or empty if valid
+        Dict[str, str]: Server name to SSE endpoint URL, empty if the value is
+        missing or malformed so that Settings.validate() reports it
     """
-    issues = {}
+    if not raw or not raw.strip():
+        return {}
+    
+    raw = raw.strip()
+    if raw.startswith(("{", "[")):
+        try:
+            parsed = json.loads(raw)
+        except ValueError:
+            return {}
+        
+        if not isinstance(parsed, dict) or not all(
+            isinstance(url, str) and url.strip() for url in parsed.values()
+        ):
+            return {}
+        
+        return {str(name): url.strip() for name, url in parsed.items()}
     
-    if not ANTHROPIC_API_KEY:
-        issues["ANTHROPIC_API_KEY"] = "Missing API key"
+    entries = [entry.strip() for entry in raw.split(",") if entry.strip()]
+    endpoints = {}
+    for index, entry in enumerate(entries):
+        name, separator, url = entry.partition("=")
+        if separator and "://" not in name:
+            endpoints[name.strip()] = url.strip()
+        elif len(entries) == 1:
+            endpoints["default"] = entry
+        else:
+            endpoints[f"server{index + 1}"] = entry
     
-    if not SSE_ENDPOINT:
-        issues["SSE_ENDPOINT"] = "Missing SSE endpoint URL"
+    return endpoints
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings read once from the environment."""
     
-    return issues
\ No newline at end of file
+    anthropic_api_key: Optional[str] = field(repr=False)
+    model_name: str
+    max_tokens: int
+    anthropic_max_inflight: int
+    anthropic_max_retries: int
+    max_history_messages: int
+    input_token_warning_threshold: int
+    sse_endpoint: str
+    sse_endpoints: Dict[str, str]
+    mcp_pool_size: int
+    mcp_connect_timeout: float
+    api_host: str
+    api_port: int
+    max_request_bytes: int
+    env: str
+    log_level: str
+    profiling: bool
+    profile_dir: str
+    
+    def validate(self) -> Dict[str, Any]:
+        """Validate essential configuration settings.
+        
+        Returns:
+            Dict[str, Any]: Dictionary of validation issues or empty if valid
+        """
+        issues = {}
+        
+        if not self.anthropic_api_key:
+            issues["ANTHROPIC_API_KEY"] = "Missing API key"
+        
+        if not self.sse_endpoint.strip():
+            issues["SSE_ENDPOINT"] = "Missing SSE endpoint URL"
+        elif not self.sse_endpoints:
+            issues["SSE_ENDPOINT"] = "Invalid SSE endpoint configuration"
+        
+        if self.anthropic_max_inflight < 1:
+            issues["ANTHROPIC_MAX_INFLIGHT"] = "Max in-flight model calls must be at least 1"
+        
+        if self.max_history_messages < 3:
+            issues["MAX_HISTORY_MESSAGES"] = "History must keep at least 3 messages"
+        
+        if self.mcp_pool_size < 1:
+            issues["MCP_POOL_SIZE"] = "Pool size must be at least 1"
+        
+        if self.mcp_connect_timeout <= 0:
+            issues["MCP_CONNECT_TIMEOUT"] = "Connect timeout must be positive"
+        
+        return issues
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, reading the environment on first use.
+    
+    Returns:
+        Settings: Cached settings instance
+    """
+    sse_endpoint = os.getenv("SSE_ENDPOINT", "http://localhost:8000/sse")
+    return Settings(
+        anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
+        model_name=os.getenv("MODEL_NAME", "claude-3-5-sonnet-20241022"),
+        max_tokens=int(os.getenv("MAX_TOKENS", "1000")),
+        anthropic_max_inflight=int(os.getenv("ANTHROPIC_MAX_INFLIGHT", "4")),
+        anthropic_max_retries=int(os.getenv("ANTHROPIC_MAX_RETRIES", "2")),
+        max_history_messages=int(os.getenv("MAX_HISTORY_MESSAGES", "20")),
+        input_token_warning_threshold=int(os.getenv("INPUT_TOKEN_WARNING_THRESHOLD", "50000")),
+        sse_endpoint=sse_endpoint,
+        sse_endpoints=parse_sse_endpoints(sse_endpoint),
+        mcp_pool_size=int(os.getenv("MCP_POOL_SIZE", "4")),
+        mcp_connect_timeout=float(os.getenv("MCP_CONNECT_TIMEOUT", "10")),
+        api_host=os.getenv("API_HOST", "0.0.0.0"),
+        api_port=int(os.getenv("API_PORT", "5000")),
+        max_request_bytes=int(os.getenv("MAX_REQUEST_BYTES", str(1024 * 1024))),
+        env=os.getenv("ENV", "development"),
+        log_level=os.getenv("LOG_LEVEL", "INFO"),
+        profiling=os.getenv("PROFILING") == "1",
+        profile_dir=os.getenv("PROFILE_DIR", "./profiler_results"),
+    )
\ No newline at end of file
@@ -1,24 +1,86 @@
 """Helper utilities for the MCP client."""
+import functools
 import logging
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 
-from src.config.settings import LOG_LEVEL
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
 
-# Configure logging
-logging.basicConfig(
-    level=LOG_LEVEL,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-logger = logging.getLogger("mcp_client")
+from src.config.settings import get_settings
 
+# Configure logging once, leaving handlers installed by a host server untouched
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=get_settings().log_level,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+@functools.lru_cache(maxsize=1)
 def setup_logger() -> logging.Logger:
     """Get configured application logger.
     
     Returns:
         logging.Logger: Configured logger instance
     """
-    return logger
+    return logging.getLogger("mcp_client")
+
+logger = setup_logger()
+
+def _json_default(obj: Any) -> Any:
+    """Serialize objects the JSON encoders do not handle natively.
+
+    MCP tool results are pydantic models, so they are dumped to plain dicts.
+    """
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(payload: Any) -> bytes:
+    """Serialize a payload to UTF-8 encoded JSON bytes.
+
+    Uses orjson when it is installed and falls back to the stdlib json module.
+
+    Args:
+        payload: JSON-serializable object
+
+    Returns:
+        bytes: Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default)
+    return json.dumps(payload, default=_json_default).encode("utf-8")
+
+def pretty_json(payload: Any) -> str:
+    """Serialize a payload to a JSON string indented by two spaces.
+
+    Args:
+        payload: JSON-serializable object
+
+    Returns:
+        str: Indented JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(payload, default=_json_default, indent=2)
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Deserialize a JSON document.
+
+    Args:
+        data: Raw JSON document as bytes or str
+
+    Returns:
+        Any: Decoded object
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def format_tool_response(tool_name: str, args: Dict[str, Any], result: str) -> str:
     """Format tool execution response for display.
@@ -33,9 +95,9 @@ def format_tool_response(tool_name: str, args: Dict[str, Any], result: str) -> s
     """
     try:
         # Try to parse and pretty-print JSON results
-        parsed_result = json.loads(result)
-        pretty_result = json.dumps(parsed_result, indent=2)
-    except (json.JSONDecodeError, TypeError):
+        parsed_result = loads_json(result)
+        pretty_result = pretty_json(parsed_result)
+    except (ValueError, TypeError):
         pretty_result = result
 
-    return f"\n[Tool: {tool_name}]\nArguments: {json.dumps(args, indent=2)}\nResult: {pretty_result}\n"
\ No newline at end of file
+    return f"\n[Tool: {tool_name}]\nArguments: {pretty_json(args)}\nResult: {pretty_result}\n"
\ No newline at end of file